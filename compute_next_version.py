@@ -1,16 +1,16 @@
 """A script for determining the next version of a package."""
 
+import contextlib
 import dataclasses as dc
 import enum
 import fnmatch
+import functools
 import logging
 import os
-import pprint
+import re
 import subprocess
-from collections import OrderedDict
-
-from wipac_dev_tools import from_environment_as_dataclass
-
+import sys
+from typing import IO, Callable, Generator, Iterator, Optional
 
 # **************************************************************************************
 # NOTE!
@@ -20,28 +20,37 @@ from wipac_dev_tools import from_environment_as_dataclass
 # **************************************************************************************
 
 
-@dc.dataclass(frozen=True)
+# dataclass(slots=True) is py 3.10+ -- on 3.9, just go without
+_DATACLASS_SLOTS_KWARGS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dc.dataclass(frozen=True, **_DATACLASS_SLOTS_KWARGS)
 class EnvConfig:
     """For storing environment variables, typed."""
 
-    IGNORE_PATHS: list[str] = dc.field(default_factory=list)
+    IGNORE_PATHS: tuple[str, ...] = ()
     FORCE_PATCH_IF_NO_COMMIT_TOKEN: bool = False
 
     def __post_init__(self):
-        # normalize IGNORE_PATHS: drop blanks, strip whitespace
+        # normalize IGNORE_PATHS: drop blanks, strip whitespace -- and freeze
+        # as a tuple, so it's hashable (used as a cache key for glob matching)
         object.__setattr__(
             self,
             "IGNORE_PATHS",
-            [ln.strip() for ln in self.IGNORE_PATHS if ln.strip()],
+            tuple(ln.strip() for ln in self.IGNORE_PATHS if ln.strip()),
         )
 
 
-ENV = from_environment_as_dataclass(EnvConfig)
-
 # version styles -- could be a StrEnum but that is py 3.11+
 VERSION_STYLE_X_Y_Z = "X.Y.Z"  # ex: 1.12.3
 VERSION_STYLE_X_Y = "X.Y"  # ex: 0.51
 
+# per version style: (number of segments, whether a PATCH bump acts like a MINOR bump)
+_VERSION_STYLE_SPECS = {
+    VERSION_STYLE_X_Y_Z: (3, False),
+    VERSION_STYLE_X_Y: (2, True),
+}
+
 
 class InvalidVersionStyle(RuntimeError):
     """Raised when the version style is invalid."""
@@ -50,54 +59,148 @@ class InvalidVersionStyle(RuntimeError):
         super().__init__(f"Invalid version style: {version_style}")
 
 
-class BumpType(enum.Enum):
-    MAJOR = enum.auto()
-    MINOR = enum.auto()
-    PATCH = enum.auto()
-    NO_BUMP = enum.auto()
+class BumpType(enum.IntEnum):
+    """The kinds of version bumps, valued by precedence (higher wins)."""
+
+    NO_BUMP = 0
+    PATCH = 1
+    MINOR = 2
+    MAJOR = 3
+
 
+BUMP_TOKENS = {
+    BumpType.MAJOR: ("[major]",),
+    BumpType.MINOR: ("[minor]",),
+    BumpType.PATCH: ("[patch]", "[fix]", "[bump]"),
+    BumpType.NO_BUMP: ("[no-bump]", "[no_bump]", "[nobump]"),
+}
 
-BUMP_TOKENS = OrderedDict(  # ordered by precedence
-    {
-        BumpType.MAJOR: ["[major]"],
-        BumpType.MINOR: ["[minor]"],
-        BumpType.PATCH: ["[patch]", "[fix]", "[bump]"],
-        BumpType.NO_BUMP: ["[no-bump]", "[no_bump]", "[nobump]"],
-    }
+# all bump tokens in one case-insensitive regex, so a title is scanned once (not
+# once per token) and never needs a lowercased copy
+_TOKEN_TO_BUMP = {tok: bump for bump, toks in BUMP_TOKENS.items() for tok in toks}
+_BUMP_TOKENS_RE = re.compile(
+    "|".join(re.escape(tok) for tok in _TOKEN_TO_BUMP),
+    re.IGNORECASE | re.ASCII,  # ASCII: so each match lowercases to a known token
 )
 
 
-def _has_bump_token(bump: BumpType, string: str) -> bool:
-    """Does the string have any of the bump type's tokens?"""
-    return any(x in string for x in BUMP_TOKENS[bump])
+def _find_bump_types(string: str) -> set[BumpType]:
+    """Get the bump types of all the bump tokens in the string (case-insensitive)."""
+    return {_TOKEN_TO_BUMP[tok.lower()] for tok in _BUMP_TOKENS_RE.findall(string)}
 
 
-def are_all_files_ignored(changed_files: list[str]) -> bool:
-    """Return True if every changed file is ignored."""
-    if not changed_files:
-        return True  # think: git commit --allow-empty -m "Trigger CI pipeline [bump]"
+def _title_bump_type(title: str) -> Optional[BumpType]:
+    """Get the highest-precedence bump type of the title's tokens (None if no token)."""
+    if "[" not in title:  # most titles have no token -- skip the regex
+        return None
+    return max(_find_bump_types(title), default=None)
 
-    ignores = [p for p in ENV.IGNORE_PATHS if not p.startswith("!")]
-    unignores = [p.removeprefix("!") for p in ENV.IGNORE_PATHS if p.startswith("!")]
 
-    for f in changed_files:
-        logging.debug(f"Checking if this changed file is ignored: {f}")
+def _has_glob_magic(string: str) -> bool:
+    """Does the string have any glob special characters?"""
+    return any(c in string for c in "*?[")
+
+
+@dc.dataclass(frozen=True)
+class CompiledGlobs:
+    """A set of globs, bucketed so that most paths never reach the regex engine.
+
+    Like fnmatch.fnmatch, globs and paths are os.path.normcase'd, so matching is
+    case-insensitive on Windows (and case-sensitive elsewhere).
+    """
+
+    exacts: frozenset[str]  # ex: 'CHANGELOG.md'
+    prefixes: tuple[str, ...]  # ex: 'docs/**' -> 'docs/'
+    suffixes: tuple[str, ...]  # ex: '*.md' -> '.md'
+    regex: Optional["re.Pattern[str]"]  # everything else, unioned
+
+    def match(self, path: str) -> bool:
+        """Does the path match any of the globs?"""
+        path = os.path.normcase(path)
+        return (
+            path in self.exacts
+            or path.startswith(self.prefixes)  # str.startswith takes a tuple
+            or path.endswith(self.suffixes)  # same
+            or bool(self.regex and self.regex.fullmatch(path))
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_globs(globs: tuple[str, ...]) -> CompiledGlobs:
+    """Bucket the globs by kind, and union the rest into a single compiled regex."""
+    exacts, prefixes, suffixes, others = set(), [], [], []
+
+    for g in map(os.path.normcase, globs):  # like fnmatch.fnmatch
+        if not _has_glob_magic(g):
+            exacts.add(g)
+        # NOTE: fnmatch's '*' also matches '/', so these are plain string ends --
+        #       and a run of '*' is just one '*', so ex: 'docs/**' is prefix 'docs/'
+        elif g.startswith("*") and not _has_glob_magic(g.lstrip("*")):
+            suffixes.append(g.lstrip("*"))
+        elif g.endswith("*") and not _has_glob_magic(g.rstrip("*")):
+            prefixes.append(g.rstrip("*"))
+        else:
+            others.append(g)
+
+    return CompiledGlobs(
+        exacts=frozenset(exacts),
+        prefixes=tuple(prefixes),
+        suffixes=tuple(suffixes),
+        regex=(
+            re.compile("|".join(f"(?:{fnmatch.translate(g)})" for g in others))
+            if others
+            else None
+        ),
+    )
+
+
+def _make_is_ignored(ignore_paths: tuple[str, ...]) -> Callable[[str], bool]:
+    """Build a predicate for whether a path is ignored by the ignore-path globs.
+
+    The globs are compiled once, here, and each path's result is cached.
+    """
+    ignores = tuple(p for p in ignore_paths if not p.startswith("!"))
+    if not ignores:
+        return lambda _: False  # nothing can be ignored, so no need to look at globs
+
+    unignores = tuple(p.removeprefix("!") for p in ignore_paths if p.startswith("!"))
+    ignores_globs = _compile_globs(ignores)
+    unignores_globs = _compile_globs(unignores)
+
+    @functools.lru_cache(maxsize=None)
+    def is_ignored(path: str) -> bool:
+        logging.debug("Checking if this changed file is ignored: %s", path)
 
         # Negations win regardless of order
-        if any(fnmatch.fnmatch(f, pat) for pat in unignores):
-            logging.debug(f'-> UNIGNORED by negation glob {["!"+p for p in unignores]}')
-            return False  # found a changed file that is NOT ignored
+        if unignores_globs.match(path):
+            logging.debug("-> UNIGNORED by a negation glob in %s", unignores)
+            return False
 
         # Otherwise, ignored if any positive pattern matches
-        elif any(fnmatch.fnmatch(f, pat) for pat in ignores):
-            logging.debug(f"-> IGNORED by glob {ignores=}")
-            continue  # this file is ignored; check next
+        elif ignores_globs.match(path):
+            logging.debug("-> IGNORED by a glob in %s", ignores)
+            return True
 
         # No matches at all => not ignored
         else:
-            logging.info(f"Found a changed non-ignored file: {f}")
             return False
 
+    return is_ignored
+
+
+def are_all_files_ignored(
+    changed_files: list[str],
+    is_ignored: Callable[[str], bool],
+) -> bool:
+    """Return True if every changed file is ignored."""
+    if not changed_files:
+        return True  # think: git commit --allow-empty -m "Trigger CI pipeline [bump]"
+
+    for f in changed_files:
+        if not is_ignored(f):
+            logging.info(f"Found a changed non-ignored file: {f}")
+            return False  # found a changed file that is NOT ignored
+
     # All files were ignored
     return True
 
@@ -106,120 +209,194 @@ class DisqualifiedCommit(RuntimeError):
     """Raised when a commit is disqualified."""
 
 
-@dc.dataclass
+@dc.dataclass(**_DATACLASS_SLOTS_KWARGS)
 class BumpableCommit:
     """Useful things to know about a commit which qualifies as bumpable."""
 
     sha: str
-    title: str  # original title (preserved for logs)
-    changed_files: list[str]
+    title: str
+    changed_files: Optional[list[str]]  # None if not listed (not needed for the bump)
+    force_patch: dc.InitVar[bool]
+    is_ignored: dc.InitVar[Callable[[str], bool]]
 
     # derived
-    title_lower: str = dc.field(init=False)
     bump_type: BumpType = dc.field(init=False)
 
-    def __post_init__(self):
-        # keep 'title' for logs, derive a lowercased view for token matching
-        self.title_lower = self.title.lower()
-
-        self.bump_type = self._figure_bump_type(self.title_lower, self.changed_files)
+    def __post_init__(self, force_patch: bool, is_ignored: Callable[[str], bool]):
+        self.bump_type = self._figure_bump_type(
+            self.title, self.changed_files, force_patch, is_ignored
+        )
 
     @staticmethod
-    def _figure_bump_type(title_lower: str, changed_files: list[str]) -> BumpType:
+    def _figure_bump_type(
+        title: str,
+        changed_files: Optional[list[str]],
+        force_patch: bool,
+        is_ignored: Callable[[str], bool],
+    ) -> BumpType:
 
         # look for a commit bump token in the title
-        for bump in BUMP_TOKENS.keys():
-            if _has_bump_token(bump, title_lower):
-                if bump == BumpType.NO_BUMP:
-                    raise DisqualifiedCommit("explicitly has 'no-bump' commit title")
-                else:
-                    return bump
+        bump = _title_bump_type(title)
+        if bump == BumpType.NO_BUMP:
+            raise DisqualifiedCommit("explicitly has 'no-bump' commit title")
+        elif bump is not None:
+            return bump
 
         # so, commit title did not have a token...
 
-        # only changed ignored files?
-        if are_all_files_ignored(changed_files):
-            raise DisqualifiedCommit("only changed ignored files")
-        # so, it changed non-ignored files...
-        elif ENV.FORCE_PATCH_IF_NO_COMMIT_TOKEN:
-            return BumpType.PATCH
-        else:
+        # not force-patching? then the changed files don't matter
+        if not force_patch:
             raise DisqualifiedCommit(
                 "did not contain a bump token (force-patching is off)"
             )
+        assert changed_files is not None  # always listed for tokenless commits
 
+        # only changed ignored files?
+        if are_all_files_ignored(changed_files, is_ignored):
+            raise DisqualifiedCommit("only changed ignored files")
+        # so, it changed non-ignored files...
+        else:
+            return BumpType.PATCH
 
-def get_bumpable_commits(first_commit: str) -> list[BumpableCommit]:
-    """Return a list of Commit objects for commits in FIRST..HEAD which warrant bumping."""
 
-    # 1) SHAs in FIRST..HEAD (newest first to match your prior behavior)
-    rev_list = subprocess.run(
-        ["git", "rev-list", f"{first_commit}..HEAD"],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    shas = [ln.strip() for ln in rev_list.stdout.splitlines() if ln.strip()]
-    commits: list[BumpableCommit] = []
+def _iter_stream_records(stream: IO[bytes], sep: bytes) -> Iterator[bytes]:
+    """Yield each non-empty sep-delimited record from the stream, as it arrives."""
+    read1 = stream.read1  # type: ignore[attr-defined]  # pipes are BufferedReaders
+    buf = bytearray()  # the incomplete record so far
+    for chunk in iter(lambda: read1(64 * 1024), b""):  # read1: whatever's ready
+        # split only the new chunk, so a huge record isn't rescanned on every read
+        head, *rest = chunk.split(sep)
+        buf += head
+        if rest:  # the chunk completed the record (and maybe others)
+            *records, tail = rest
+            yield from (r for r in (bytes(buf), *records) if r)
+            buf = bytearray(tail)
+    if buf:
+        yield bytes(buf)
+
+
+def _stream_git_log(
+    rev_range: str,
+    name_only: bool,
+) -> Generator[tuple[str, str, Optional[list[str]]], None, None]:
+    """Yield (sha, title, changed files) for each commit in the range, newest first.
+
+    git's output is streamed, so if the caller stops early, git is stopped too.
+    The changed files are only listed if `name_only` (otherwise, they're None).
+    """
 
-    for sha in shas:
+    # NUL-delimited (-z) as:
+    #      <RS><sha><US><title>\n<file>\0<file>\0...\0
+    cmd = [
+        "git",
+        "log",
+        rev_range,
+        "-z",
+        "--no-renames",  # list both sides of a rename (and skip rename detection)
+        "--pretty=format:%x1e%H%x1f%s",
+    ]
+    if name_only:
+        cmd.append("--name-only")
+
+    # keep as bytes -- only the parts we use get decoded
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+        assert proc.stdout  # for mypy
+        try:
+            for record in _iter_stream_records(proc.stdout, b"\x1e"):
 
-        # 2a) title (subject line only)
-        show_title = subprocess.run(
-            ["git", "show", "-s", "--format=%s", sha],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        title = show_title.stdout.strip()
-
-        # 2b) files changed in that commit
-        diff_tree = subprocess.run(
-            ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", sha],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        files = [ln.strip() for ln in diff_tree.stdout.splitlines() if ln.strip()]
+                # sha & title (subject line only)
+                header, _, files_blob = record.rstrip(b"\0").partition(b"\n")
+                sha_bytes, _, title_bytes = header.partition(b"\x1f")
+                sha = sha_bytes.decode("ascii")
+                title = title_bytes.decode("utf-8", errors="replace")
 
-        try:
-            commits.append(BumpableCommit(sha=sha, title=title, changed_files=files))
-        except DisqualifiedCommit as e:
-            # Skip commits that intentionally have no effect on versioning
-            logging.info(f"Commit is disqualified: {sha=} {title=} reason='{e}'")
-            continue
+                # files changed in that commit -- interned, since the same paths
+                # tend to show up in many commits
+                files = (
+                    [sys.intern(os.fsdecode(f)) for f in files_blob.split(b"\0") if f]
+                    if name_only
+                    else None
+                )
 
-    # log & return
-    logging.info(
-        f"Found {len(shas)} commits "
-        f"({len(commits)} qualified, {len(shas)-len(commits)} disqualified)"
-    )
-    logging.info("<start> (qualified commits)")
-    for c in commits:
-        logging.info(pprint.pformat(dc.asdict(c), indent=4))
-    logging.info("<end>")
-    return commits
+                yield sha, title, files
+        except GeneratorExit:
+            proc.kill()  # caller has seen enough, so don't wait on the rest of the log
+            raise
 
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
 
-def major_bump(major: int) -> tuple[int, int, int]:
-    """Increment for a major bump."""
-    major += 1
-    minor = 0
-    patch = 0
-    return major, minor, patch
 
+def get_bumpable_commits(
+    first_commit: str,
+    env: EnvConfig,
+) -> Generator[BumpableCommit, None, None]:
+    """Yield Commit objects for commits in FIRST..HEAD which warrant bumping.
 
-def minor_bump(major: int, minor: int) -> tuple[int, int, int]:
-    """Increment for a minor bump."""
-    minor += 1
-    patch = 0
-    return major, minor, patch
+    Commits are yielded newest first, so the caller can stop consuming as soon
+    as it has seen enough -- git's output is streamed, so git is stopped then too.
 
+    Only what is needed to decide the bump is looked at: changed files are only
+    listed when no commit has an explicit bump token, since then a forced patch
+    is the only possible bump (and one is enough).
+    """
+    rev_range = f"{first_commit}..HEAD"
+    n_commits = 0
+    has_explicit_bump = False
+    tokenless_shas: set[str] = set()  # only filled when force-patching
+    is_ignored = _make_is_ignored(env.IGNORE_PATHS)
+
+    def _qualify(
+        sha: str, title: str, files: Optional[list[str]]
+    ) -> Optional[BumpableCommit]:
+        """Get the commit as a BumpableCommit, or None if it's disqualified."""
+        try:
+            return BumpableCommit(
+                sha=sha,
+                title=title,
+                changed_files=files,
+                force_patch=env.FORCE_PATCH_IF_NO_COMMIT_TOKEN,
+                is_ignored=is_ignored,
+            )
+        except DisqualifiedCommit as e:
+            # Skip commits that intentionally have no effect on versioning
+            logging.info(f"Commit is disqualified: {sha=} {title=} reason='{e}'")
+            return None
+
+    # 1) titles only -- for most commits, that's all it takes
+    with contextlib.closing(_stream_git_log(rev_range, name_only=False)) as git_log:
+        for sha, title, files in git_log:
+            n_commits += 1
+
+            if (
+                env.FORCE_PATCH_IF_NO_COMMIT_TOKEN
+                and _title_bump_type(title) is None
+            ):
+                tokenless_shas.add(sha)  # needs its changed files -- see below
+                continue
+
+            if commit := _qualify(sha, title, files):
+                yield commit
+                has_explicit_bump = True
+
+    logging.info(f"Found {n_commits} commits in {rev_range}")
+
+    # 2) tokenless commits (force-patching) -- these need their changed files
+    if not tokenless_shas:
+        return
+    elif has_explicit_bump:
+        return logging.info(
+            f"Not checking the changed files of {len(tokenless_shas)} tokenless "
+            f"commit(s) since a forced patch cannot outrank an explicit bump token"
+        )
+    with contextlib.closing(_stream_git_log(rev_range, name_only=True)) as git_log:
+        for sha, title, files in git_log:
+            if sha not in tokenless_shas:
+                continue  # already handled in 1)
 
-def patch_bump(major: int, minor: int, patch: int) -> tuple[int, int, int]:
-    """Increment for a patch bump."""
-    patch += 1
-    return major, minor, patch
+            if commit := _qualify(sha, title, files):
+                yield commit
+                return  # one forced patch is all it takes
 
 
 def increment_bump(version_tag: str, bump: BumpType, version_style: str) -> str:
@@ -230,70 +407,82 @@ def increment_bump(version_tag: str, bump: BumpType, version_style: str) -> str:
       - MINOR: (M, N, P) -> (M, N+1, 0)
       - PATCH: (M, N, P) -> (M, N, P+1)   (but for X.Y style PATCH behaves like MINOR)
     """
+    try:
+        n_segments, patch_is_minor = _VERSION_STYLE_SPECS[version_style]
+    except KeyError:
+        raise InvalidVersionStyle(version_style) from None
+
     # get the starting version segments
     try:
-        if version_style == VERSION_STYLE_X_Y_Z:
-            major, minor, patch = map(int, version_tag.split("."))
-        elif version_style == VERSION_STYLE_X_Y:
-            major, minor = map(int, version_tag.split("."))
-            patch = 0  # ignored for X.Y
-        else:
-            raise InvalidVersionStyle(version_style)
+        segments = [int(x) for x in version_tag.split(".")]
+        if len(segments) != n_segments:
+            raise ValueError(f"expected {n_segments} segments, got {len(segments)}")
     except ValueError as e:
         raise ValueError(
             f"Could not parse version from {version_tag=} for {version_style=}"
         ) from e
+    major, minor, patch = (segments + [0])[:3]  # 'patch' is ignored for X.Y
+
+    # X.Y -> a PATCH bump is equivalent to a MINOR bump
+    if bump is BumpType.PATCH and patch_is_minor:
+        bump = BumpType.MINOR
 
     # MAJOR bump
-    if bump == BumpType.MAJOR:
-        major, minor, patch = major_bump(major)
+    if bump is BumpType.MAJOR:
+        major, minor, patch = major + 1, 0, 0
     # MINOR bump
-    elif bump == BumpType.MINOR:
-        major, minor, patch = minor_bump(major, minor)
+    elif bump is BumpType.MINOR:
+        major, minor, patch = major, minor + 1, 0
     # PATCH bump
-    elif bump == BumpType.PATCH:
-        # X.Y.Z -> normal
-        if version_style == VERSION_STYLE_X_Y_Z:
-            major, minor, patch = patch_bump(major, minor, patch)
-        # X.Y -> a PATCH bump is equivalent to a MINOR bump
-        elif version_style == VERSION_STYLE_X_Y:
-            major, minor, patch = minor_bump(major, minor)
-            # 'patch' value ^^^ will be ignored in the end
-        else:
-            raise InvalidVersionStyle(version_style)
+    elif bump is BumpType.PATCH:
+        major, minor, patch = major, minor, patch + 1
     else:
         raise ValueError(f"Bump type not supported: {bump}")
 
     # stringify the next version
-    if version_style == VERSION_STYLE_X_Y_Z:
-        return f"{major}.{minor}.{patch}"
-    elif version_style == VERSION_STYLE_X_Y:
-        return f"{major}.{minor}"  # no patch
-    else:
-        raise InvalidVersionStyle(version_style)
+    return ".".join(str(x) for x in (major, minor, patch)[:n_segments])
 
 
 def work(
     version_tag: str,
     first_commit: str,
     version_style: str,
+    env: EnvConfig,
 ) -> None:
     """Core behavior: detect bump and print the next version (or nothing)."""
     logging.info(f"{version_tag=}")
     logging.info(f"{first_commit=}")
     logging.info(f"{version_style=}")
+    logging.info(f"{env=}")
 
-    # Pull commits which warrant bumping
-    commits = get_bumpable_commits(first_commit)
-    if not commits:
+    # Pull commits which warrant bumping, and decide bump as we go
+    commits: list[BumpableCommit] = []
+    max_bump: Optional[BumpType] = None
+    # NOTE: closing() -- on an early exit, this stops git right away (not at gc)
+    with contextlib.closing(get_bumpable_commits(first_commit, env)) as stream:
+        for c in stream:
+            commits.append(c)
+            if max_bump is None or c.bump_type > max_bump:
+                max_bump = c.bump_type
+            if max_bump is BumpType.MAJOR:  # nothing outranks this, so stop looking
+                logging.info(f"Found a major bump ({c.sha}), skipping older commits")
+                break
+
+    logging.info(f"Found {len(commits)} qualified commits")
+    if commits and logging.getLogger().isEnabledFor(logging.INFO):
+        # one write for the whole block, rather than one per commit
+        lines = ["<start> (qualified commits)"]
+        for c in commits:
+            line = f"{c.sha} {c.bump_type.name} {c.title!r}"
+            if c.changed_files is not None:  # only listed when force-patching
+                line += f" files={len(c.changed_files)}"
+            lines.append(line)
+        lines.append("<end>")
+        logging.info("\n".join(lines))
+
+    if max_bump is None:
         return logging.info("Commit log(s) don't signify a version bump.")
-
-    # Decide bump
-    max_bump = max(
-        [c.bump_type for c in commits],
-        key=lambda x: -1 * list(BUMP_TOKENS.keys()).index(x),  # -1 makes it a max
-    )
-    if max_bump == BumpType.NO_BUMP:
+    elif max_bump == BumpType.NO_BUMP:
         raise RuntimeError("detected [no-bump] after commit filtering")
 
     # Increment bump
@@ -301,14 +490,40 @@ def work(
     print(next_version)
 
 
+def _parse_bool(string: str) -> bool:
+    """Parse a bool env var's value.
+
+    True: 'y', 'yes', 't', 'true', 'on', '1'
+    False: 'n', 'no', 'f', 'false', 'off', '0'
+    (case-insensitive) -- anything else raises ValueError.
+    """
+    if string.lower() in ("y", "yes", "t", "true", "on", "1"):
+        return True
+    elif string.lower() in ("n", "no", "f", "false", "off", "0"):
+        return False
+    else:
+        raise ValueError(f"Invalid truth value: {string!r}")
+
+
 def main() -> None:
     """Parse environment variables, configure logging, and run work()."""
     logging.basicConfig(level=logging.DEBUG)
 
+    # strip the tag's leading 'v' (ex: v1.2.3 -> 1.2.3)
+    version_tag = os.environ["LATEST_VERSION_TAG"]
+    if version_tag[:1] in ("v", "V"):
+        version_tag = version_tag[1:]
+
     work(
-        version_tag=os.environ["LATEST_VERSION_TAG"].lower().lstrip("v"),
+        version_tag=version_tag.lower(),
         first_commit=os.environ["FIRST_COMMIT"],
         version_style=os.environ.get("VERSION_STYLE", VERSION_STYLE_X_Y_Z).upper(),
+        env=EnvConfig(
+            IGNORE_PATHS=tuple(os.environ.get("IGNORE_PATHS", "").split()),
+            FORCE_PATCH_IF_NO_COMMIT_TOKEN=_parse_bool(
+                os.environ.get("FORCE_PATCH_IF_NO_COMMIT_TOKEN", "false")
+            ),
+        ),
     )
 
 
@@ -0,0 +1,7 @@
+"""Shared pytest setup for the tests."""
+
+import sys
+from pathlib import Path
+
+# Ensure the module path includes the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -1,15 +1,15 @@
 """Test compute_next_version.py"""
 
+import fnmatch
+import io
+import logging
+import ntpath
+import os
 import subprocess
-import sys
-from pathlib import Path
-from subprocess import CompletedProcess
 
 import pytest
 
-# Ensure the module path includes the project root
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-import compute_next_version as mod  # noqa: E402
+import compute_next_version as mod  # project root is put on sys.path by conftest.py
 
 
 # -----------------------------------------------------------------------------
@@ -17,72 +17,203 @@ import compute_next_version as mod  # noqa: E402
 # -----------------------------------------------------------------------------
 
 
+class _FakeGitProcess:
+    """A stand-in for subprocess.Popen, whose stdout is canned git output."""
+
+    def __init__(self, cmd, stdout_bytes):
+        self.args = cmd
+        self.stdout = io.BytesIO(stdout_bytes)
+        self.returncode = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stdout.close()
+        self.wait()
+
+    def wait(self):
+        if self.returncode is None:
+            self.returncode = 0
+        return self.returncode
+
+    def kill(self):
+        self.returncode = -9
+
+
 def _mock_git_repo(records):
     """
-    Create a patchable subprocess.run that emulates a git repo for:
-      - git rev-list <range>
-      - git show -s --format=%s <sha>
-      - git diff-tree --no-commit-id --name-only -r <sha>
+    Create a patchable subprocess.Popen that emulates a git repo for:
+      - git log <range> -z --no-renames --pretty=format:%x1e%H%x1f%s [--name-only]
 
     `records` is a list of tuples: (title, [files]) in newest-first order.
     We fabricate deterministic SHAs from Peanuts names for fun.
     """
 
-    shas = []
-    titles = {}
-    files_map = {}
-
+    # git-log -z output: each commit is "<RS><sha><US><title>", then (if any files)
+    # "\n" + NUL-terminated files -- commits are joined by "\0"
+    log_records = []
+    log_records_name_only = []
     for i, (title, files) in enumerate(records):
         base = str(i).encode("utf-8").hex()
         sha = base[:7]
-        shas.append(sha)
-        titles[sha] = title
-        files_map[sha] = list(files or [])
-
-    # rev-list returns newest-first by default here
-    rev_list_out = "\n".join(shas) + ("\n" if shas else "")
-
-    def _runner(cmd, capture_output=False, text=False, check=False):
-        assert isinstance(cmd, list), f"Command must be a list, got {cmd!r}"
-
-        if cmd[:2] == ["git", "rev-list"]:
-            # ["git", "rev-list", "<range>"]
-            return CompletedProcess(cmd, 0, stdout=rev_list_out, stderr="")
-
-        if cmd[:4] == ["git", "show", "-s", "--format=%s"]:
-            # ["git", "show", "-s", "--format=%s", sha]
-            sha = cmd[4]
-            out = titles.get(sha, "")
-            if text:
-                return CompletedProcess(cmd, 0, stdout=f"{out}\n", stderr="")
-            else:
-                return CompletedProcess(
-                    cmd, 0, stdout=(out + "\n").encode(), stderr=b""
-                )
-
-        if cmd[:5] == ["git", "diff-tree", "--no-commit-id", "--name-only", "-r"]:
-            # ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", <sha>]
-            sha = cmd[5]
-            paths = files_map.get(sha, [])
-            out = "\n".join(paths) + ("\n" if paths else "")
-            if text:
-                return CompletedProcess(cmd, 0, stdout=out, stderr="")
-            else:
-                return CompletedProcess(cmd, 0, stdout=out.encode(), stderr=b"")
+        rec = f"\x1e{sha}\x1f{title}"
+        log_records.append(rec)
+        if files:
+            rec += "\n" + "".join(f"{f}\0" for f in files)
+        log_records_name_only.append(rec)
+
+    # encode both outputs once, up front -- not on every call
+    log_out = "\0".join(log_records).encode()
+    log_out_name_only = "\0".join(log_records_name_only).encode()
+
+    def _popen(cmd, stdout=None):
+        assert stdout == subprocess.PIPE
+
+        if cmd[:2] == ["git", "log"]:
+            # ["git", "log", "<range>", "-z", ..., ("--name-only")]
+            out = log_out_name_only if "--name-only" in cmd else log_out
+            proc = _FakeGitProcess(cmd, out)
+            _popen.procs.append(proc)  # type: ignore[attr-defined]
+            return proc
 
         assert False, f"Unexpected command: {cmd}"
 
-    return _runner
+    _popen.procs = []  # type: ignore[attr-defined]
+    return _popen
 
 
-def _set_env(ignore_paths: list[str], force_patch: bool):
-    """Swap in a new EnvConfig for the module (since the real one is frozen)."""
-    mod.ENV = mod.EnvConfig(
-        IGNORE_PATHS=list(ignore_paths),
+def _make_env(ignore_paths: list[str], force_patch: bool) -> mod.EnvConfig:
+    """Make an EnvConfig, like main() would from the environment."""
+    return mod.EnvConfig(
+        IGNORE_PATHS=tuple(ignore_paths),
         FORCE_PATCH_IF_NO_COMMIT_TOKEN=bool(force_patch),
     )
 
 
+# -----------------------------------------------------------------------------
+# git log stream parsing
+# -----------------------------------------------------------------------------
+
+
+class _TrickleStream(io.BytesIO):
+    """A pipe-like stream whose read1() hands out at most `n` bytes at a time."""
+
+    def __init__(self, data, n):
+        super().__init__(data)
+        self.n = n
+
+    def read1(self, size=-1):
+        return super().read1(self.n)
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 1024])
+def test_050_stream_records_span_reads(n):
+    """Records are reassembled no matter how the reads split them."""
+    data = b"\x1eaaa\x1e\x1e" + b"b" * 100 + b"\x1ec"
+    records = list(mod._iter_stream_records(_TrickleStream(data, n), b"\x1e"))
+    assert records == [b"aaa", b"b" * 100, b"c"]
+
+
+# -----------------------------------------------------------------------------
+# ignore-path globs
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "globs",
+    [
+        ("*.md",),
+        ("docs/**",),
+        ("CHANGELOG.md", "README*"),
+        ("src/*.py", "[ab]*", "*.tar.gz"),
+        ("*",),
+        ("**/*.md", "src/**/a.py"),
+    ],
+)
+def test_100_compiled_globs_match_like_fnmatch(globs):
+    """The bucketed matcher agrees with fnmatch for every kind of glob."""
+    paths = [
+        "README.md",
+        "docs/a.md",
+        "docs/x/y.py",
+        "src/a.py",
+        "src/sub/a.py",
+        "a.tar.gz",
+        "bcd",
+        "CHANGELOG.md",
+        "CHANGELOG.md.bak",
+    ]
+    compiled = mod._compile_globs(globs)
+    for p in paths:
+        assert compiled.match(p) == any(fnmatch.fnmatch(p, g) for g in globs), p
+
+
+def test_102_star_runs_skip_the_regex():
+    """Leading/trailing runs of '*' are bucketed as plain string ends, not regex."""
+    compiled = mod._compile_globs(("docs/**", "**.md"))
+    assert compiled.prefixes == ("docs/",)
+    assert compiled.suffixes == (".md",)
+    assert compiled.regex is None
+
+
+def test_105_compiled_globs_normcase_like_fnmatch(monkeypatch):
+    """Like fnmatch.fnmatch, matching follows os.path.normcase (ex: on Windows)."""
+    monkeypatch.setattr(os.path, "normcase", ntpath.normcase)
+    mod._compile_globs.cache_clear()  # don't reuse (or leave behind) posix globs
+    try:
+        compiled = mod._compile_globs(("README*", "docs/**", "*.MD"))
+        for p in ["readme.md", "Docs/x.txt", "a/b.md", "src/a.py"]:
+            expected = any(fnmatch.fnmatch(p, g) for g in ("README*", "docs/**", "*.MD"))
+            assert compiled.match(p) == expected, p
+        assert compiled.match("readme.md")  # case-insensitive, like the baseline
+    finally:
+        mod._compile_globs.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "ignore_paths",
+    [
+        ("docs/**", "!docs/keep.md"),
+        ("!docs/keep.md", "docs/**"),  # order doesn't matter
+    ],
+)
+@pytest.mark.parametrize(
+    "files,expected",
+    [
+        (["docs/a.md", "docs/x/y.md"], True),
+        (["docs/a.md", "docs/keep.md"], False),  # negation wins
+        (["docs/keep.md"], False),
+        (["docs/a.md", "src/a.py"], False),
+    ],
+)
+def test_110_negated_globs_unignore(ignore_paths, files, expected):
+    """A '!' glob un-ignores what the other globs ignore, regardless of order."""
+    is_ignored = mod._make_is_ignored(ignore_paths)
+    assert mod.are_all_files_ignored(files, is_ignored) == expected
+
+
+# -----------------------------------------------------------------------------
+# bump tokens
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "title,expected",
+    [
+        ("feat: x", None),
+        ("feat: x [MINOR]", mod.BumpType.MINOR),
+        ("fix: [Patch] x [no-bump]", mod.BumpType.PATCH),
+        ("chore: [NoBump]", mod.BumpType.NO_BUMP),
+        ("feat: [major] [minor]", mod.BumpType.MAJOR),
+        ("feat: [m\u0131nor]", None),  # dotless i is not an 'i'
+    ],
+)
+def test_150_title_bump_type_is_case_insensitive(title, expected):
+    """Tokens match in any (ASCII) case, and the highest-precedence one wins."""
+    assert mod._title_bump_type(title) == expected
+
+
 # -----------------------------------------------------------------------------
 # increment_bump (pure bump math)
 # -----------------------------------------------------------------------------
@@ -132,10 +263,10 @@ def test_230_increment_bad_tag_shape_raises():
 
 def test_300_work_semver_patch_from_token(monkeypatch, capsys):
     """v1.2.3 with an explicit [patch] token -> 1.2.4 printed."""
-    _set_env(ignore_paths=[], force_patch=False)
+    env = _make_env(ignore_paths=[], force_patch=False)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("fix: squashed a bug [patch]", ["src/a.py", "README.md"]),  # bump
@@ -147,17 +278,18 @@ def test_300_work_semver_patch_from_token(monkeypatch, capsys):
         version_tag="1.2.3",
         first_commit="abc123",
         version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
     )
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == "1.2.4"
 
 
 def test_310_work_no_tokens_all_files_ignored_no_output(monkeypatch, capsys):
     """No tokens + all files ignored -> no print (no bump)."""
-    _set_env(ignore_paths=["docs/**", "*.md"], force_patch=False)
+    env = _make_env(ignore_paths=["docs/**", "*.md"], force_patch=False)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("docs: update readme", ["docs/README.md"]),  # non bump
@@ -170,17 +302,18 @@ def test_310_work_no_tokens_all_files_ignored_no_output(monkeypatch, capsys):
         version_tag="2.3.4",
         first_commit="abc123",
         version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
     )
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == ""
 
 
 def test_320_work_force_patch_when_no_token_semver(monkeypatch, capsys):
     """No tokens + a non-ignored change + force_patch=True -> patch bump."""
-    _set_env(ignore_paths=["*.md"], force_patch=True)
+    env = _make_env(ignore_paths=["*.md"], force_patch=True)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("refactor: cleanup modules", ["src/core.py", "README.md"]),  # bump
@@ -192,17 +325,18 @@ def test_320_work_force_patch_when_no_token_semver(monkeypatch, capsys):
         version_tag="0.9.9",
         first_commit="abc123",
         version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
     )
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == "0.9.10"
 
 
 def test_330_work_patch_token_behaves_as_minor_in_xy(monkeypatch, capsys):
     """In X.Y mode, [patch] acts like MINOR; 1.2 -> 1.3."""
-    _set_env(ignore_paths=[], force_patch=False)
+    env = _make_env(ignore_paths=[], force_patch=False)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("fix: small bug [patch]", ["src/a.py"]),  # bump
@@ -214,17 +348,18 @@ def test_330_work_patch_token_behaves_as_minor_in_xy(monkeypatch, capsys):
         version_tag="1.2",
         first_commit="abc123",
         version_style=mod.VERSION_STYLE_X_Y,
+        env=env,
     )
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == "1.3"
 
 
 def test_340_work_all_commits_no_bump_explicit(monkeypatch, capsys):
     """All titles marked [no-bump] -> no output (they are disqualified inside Commit)."""
-    _set_env(ignore_paths=[], force_patch=False)
+    env = _make_env(ignore_paths=[], force_patch=False)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("chore: x [no-bump]", ["src/a.py"]),  # non bump
@@ -237,17 +372,18 @@ def test_340_work_all_commits_no_bump_explicit(monkeypatch, capsys):
         version_tag="3.4.5",
         first_commit="abc123",
         version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
     )
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == ""
 
 
 def test_350_work_bad_tag_shape_raises(monkeypatch):
     """Bad tag for selected style should raise in increment_bump path."""
-    _set_env(ignore_paths=[], force_patch=False)
+    env = _make_env(ignore_paths=[], force_patch=False)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("fix: z [patch]", ["src/a.py"]),  # bump
@@ -260,6 +396,7 @@ def test_350_work_bad_tag_shape_raises(monkeypatch):
             version_tag="1.2",  # invalid for X.Y.Z
             first_commit="abc123",
             version_style=mod.VERSION_STYLE_X_Y_Z,
+            env=env,
         )
 
 
@@ -267,10 +404,10 @@ def test_360_work_no_tokens_some_ignored_some_not_force_patch_false(
     monkeypatch, capsys
 ):
     """Tokenless changes with a non-ignored file but force_patch=False -> no bump."""
-    _set_env(ignore_paths=["docs/**"], force_patch=False)
+    env = _make_env(ignore_paths=["docs/**"], force_patch=False)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("chore: x", ["docs/README.md"]),  # non bump
@@ -283,17 +420,18 @@ def test_360_work_no_tokens_some_ignored_some_not_force_patch_false(
         version_tag="4.5.6",
         first_commit="abc123",
         version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
     )
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == ""
 
 
 def test_370_work_explicit_bump(monkeypatch, capsys):
     """Test."""
-    _set_env(ignore_paths=["docs/**"], force_patch=True)
+    env = _make_env(ignore_paths=["docs/**"], force_patch=True)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("chore: x [major]", ["docs/README.md"]),  # bump b/c explicit
@@ -306,17 +444,18 @@ def test_370_work_explicit_bump(monkeypatch, capsys):
         version_tag="4.5.6",
         first_commit="abc123",
         version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
     )
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == "5.0.0"
 
 
 def test_380_work_(monkeypatch, capsys):
     """Test."""
-    _set_env(ignore_paths=["docs/**"], force_patch=True)
+    env = _make_env(ignore_paths=["docs/**"], force_patch=True)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("chore: x", ["docs/snoopy.md"]),  # non bump
@@ -329,17 +468,18 @@ def test_380_work_(monkeypatch, capsys):
         version_tag="4.5.6",
         first_commit="abc123",
         version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
     )
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == ""
 
 
 def test_390_work_(monkeypatch, capsys):
     """Test."""
-    _set_env(ignore_paths=["docs/**"], force_patch=True)
+    env = _make_env(ignore_paths=["docs/**"], force_patch=True)
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("chore: x [minor]", []),  # bump
@@ -351,22 +491,154 @@ def test_390_work_(monkeypatch, capsys):
         version_tag="4.5.6",
         first_commit="abc123",
         version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
     )
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == "4.6.0"
 
 
+def test_392_work_major_stops_reading_git_log(monkeypatch, capsys):
+    """Once a [major] commit is seen, git is stopped instead of read to the end."""
+    env = _make_env(ignore_paths=[], force_patch=False)
+    popen = _mock_git_repo(
+        [
+            ("feat: x [major]", ["src/a.py"]),  # bump
+            ("fix: y [patch]", ["src/b.py"]),  # never looked at
+        ]
+    )
+    monkeypatch.setattr(subprocess, "Popen", popen)
+
+    mod.work(
+        version_tag="4.5.6",
+        first_commit="abc123",
+        version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
+    )
+    out = capsys.readouterr().out.rstrip("\n")
+    assert out == "5.0.0"
+    assert [p.returncode for p in popen.procs] == [-9]  # killed
+
+
+@pytest.mark.parametrize(
+    "records,expected,n_git_logs",
+    [
+        # an explicit token outranks any forced patch -> changed files never listed
+        ([("refactor: x", ["src/a.py"]), ("fix: y [patch]", ["b.py"])], "0.9.10", 1),
+        # only tokenless commits -> changed files are listed (a 2nd git log)
+        ([("refactor: x", ["README.md"]), ("chore: y", ["src/b.py"])], "0.9.10", 2),
+        ([("refactor: x", ["README.md"]), ("chore: y [no-bump]", ["a.py"])], "", 2),
+    ],
+)
+def test_393_work_force_patch_lists_files_only_if_needed(
+    monkeypatch, capsys, records, expected, n_git_logs
+):
+    """With force-patching, changed files are only listed when no title decides."""
+    env = _make_env(ignore_paths=["*.md"], force_patch=True)
+    popen = _mock_git_repo(records)
+    monkeypatch.setattr(subprocess, "Popen", popen)
+
+    mod.work(
+        version_tag="0.9.9",
+        first_commit="abc123",
+        version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
+    )
+    out = capsys.readouterr().out.rstrip("\n")
+    assert out == expected
+    assert len(popen.procs) == n_git_logs
+    assert ["--name-only" in p.args for p in popen.procs] == [False, True][:n_git_logs]
+
+
+@pytest.mark.parametrize(
+    "files,expected",
+    [
+        (["docs/keep.md"], "1.2.4"),  # un-ignored by the negation
+        (["docs/other.md"], ""),
+    ],
+)
+def test_394_work_negated_ignore_path_forces_patch(
+    monkeypatch, capsys, files, expected
+):
+    """No tokens + a change to a negated ('!') ignore path -> forced patch bump."""
+    env = _make_env(ignore_paths=["docs/**", "!docs/keep.md"], force_patch=True)
+    monkeypatch.setattr(
+        subprocess,
+        "Popen",
+        _mock_git_repo(
+            [
+                ("docs: tweak", files),
+            ]
+        ),
+    )
+
+    mod.work(
+        version_tag="1.2.3",
+        first_commit="abc123",
+        version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
+    )
+    out = capsys.readouterr().out.rstrip("\n")
+    assert out == expected
+
+
+def test_395_work_highest_token_in_a_title_wins(monkeypatch, capsys):
+    """A title with several tokens bumps by the highest-precedence one."""
+    env = _make_env(ignore_paths=[], force_patch=False)
+    monkeypatch.setattr(
+        subprocess,
+        "Popen",
+        _mock_git_repo(
+            [
+                ("fix: x [no-bump] [patch] [MAJOR]", ["src/a.py"]),  # bump
+            ]
+        ),
+    )
+
+    mod.work(
+        version_tag="4.5.6",
+        first_commit="abc123",
+        version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
+    )
+    out = capsys.readouterr().out.rstrip("\n")
+    assert out == "5.0.0"
+
+
+@pytest.mark.parametrize(
+    "title,expected_line_end",
+    [
+        ("feat: b [minor]", "MINOR 'feat: b [minor]'"),  # files never listed
+        ("feat: b", "PATCH 'feat: b' files=1"),  # forced patch, so files listed
+    ],
+)
+def test_396_work_logs_file_count_only_when_listed(
+    monkeypatch, caplog, title, expected_line_end
+):
+    """The qualified-commits log doesn't claim 'files=0' for unlisted files."""
+    caplog.set_level(logging.INFO)
+    env = _make_env(ignore_paths=[], force_patch=True)
+    monkeypatch.setattr(subprocess, "Popen", _mock_git_repo([(title, ["b.py"])]))
+
+    mod.work(
+        version_tag="1.2.3",
+        first_commit="abc123",
+        version_style=mod.VERSION_STYLE_X_Y_Z,
+        env=env,
+    )
+    block = next(m for m in caplog.messages if m.startswith("<start>"))
+    assert block.splitlines()[1].endswith(expected_line_end)
+
+
 # -----------------------------------------------------------------------------
 # main() env handling integration
 # -----------------------------------------------------------------------------
 
 
 def test_400_main_reads_env_and_strips_v(monkeypatch, capsys):
-    """main() should parse env, lower().lstrip('v'), and print bumped version."""
-    _set_env(ignore_paths=[], force_patch=False)
+    """main() should parse env, strip a leading 'v', and print bumped version."""
     monkeypatch.setattr(
         subprocess,
-        "run",
+        "Popen",
         _mock_git_repo(
             [
                 ("fix: z [patch]", ["src/x.py"]),
@@ -375,13 +647,71 @@ def test_400_main_reads_env_and_strips_v(monkeypatch, capsys):
     )
 
     env = {
-        "LATEST_VERSION_TAG": "V1.2.3",  # covered by lower().lstrip("v") -> "1.2.3"
+        "LATEST_VERSION_TAG": "V1.2.3",  # leading "V" is stripped -> "1.2.3"
         "FIRST_COMMIT": "abc123",
         "VERSION_STYLE": mod.VERSION_STYLE_X_Y_Z,
+        "IGNORE_PATHS": "",
+        "FORCE_PATCH_IF_NO_COMMIT_TOKEN": "false",
     }
     for k, v in env.items():
         monkeypatch.setenv(k, v)
 
     mod.main()
-    out = capsys.readouterr().out.strip()
+    out = capsys.readouterr().out.rstrip("\n")
     assert out == "1.2.4"
+
+
+@pytest.mark.parametrize(
+    "files,force_patch,expected",
+    [
+        (["docs/README.md", "notes.md"], "true", ""),
+        (["docs/README.md", "src/x.py"], "true", "1.2.4"),
+        (["docs/README.md", "src/x.py"], "YES", "1.2.4"),
+        (["docs/README.md", "src/x.py"], "1", "1.2.4"),
+        (["docs/README.md", "src/x.py"], "off", ""),
+    ],
+)
+def test_410_main_reads_ignore_paths_and_force_patch(
+    monkeypatch, capsys, files, force_patch, expected
+):
+    """main() should parse newline-delimited ignore-paths and the force-patch flag."""
+    monkeypatch.setattr(
+        subprocess,
+        "Popen",
+        _mock_git_repo(
+            [
+                ("chore: no token here", files),
+            ]
+        ),
+    )
+
+    env = {
+        "LATEST_VERSION_TAG": "v1.2.3",
+        "FIRST_COMMIT": "abc123",
+        "VERSION_STYLE": mod.VERSION_STYLE_X_Y_Z,
+        "IGNORE_PATHS": "docs/**\n  *.md\n",
+        "FORCE_PATCH_IF_NO_COMMIT_TOKEN": force_patch,
+    }
+    for k, v in env.items():
+        monkeypatch.setenv(k, v)
+
+    mod.main()
+    out = capsys.readouterr().out.rstrip("\n")
+    assert out == expected
+
+
+@pytest.mark.parametrize("force_patch", ["", " true", "maybe"])
+def test_420_main_rejects_invalid_force_patch(monkeypatch, force_patch):
+    """An unrecognized force-patch value is an error, not a silent False."""
+    monkeypatch.setattr(subprocess, "Popen", _mock_git_repo([]))
+
+    env = {
+        "LATEST_VERSION_TAG": "v1.2.3",
+        "FIRST_COMMIT": "abc123",
+        "FORCE_PATCH_IF_NO_COMMIT_TOKEN": force_patch,
+    }
+    for k, v in env.items():
+        monkeypatch.setenv(k, v)
+
+    with pytest.raises(ValueError):
+        mod.main()